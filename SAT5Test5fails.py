@@ -1,206 +1,292 @@
-memo = {}
-
-def is_satisfied(clause, assignment):
-    return any((lit > 0 and assignment.get(abs(lit), False)) or (lit < 0 and not assignment.get(abs(lit), False)) for lit in clause)
-
-def is_unsatisfied(clause, assignment):
-    return all((lit > 0 and not assignment.get(abs(lit), True)) or (lit < 0 and assignment.get(abs(lit), False)) for lit in clause)
-
-def dpll(clauses, assignment={}):
-    key = tuple(sorted(assignment.items()))
-    if key in memo:
-        return memo[key]
-
-    if all(is_satisfied(clause, assignment) for clause in clauses):
-        memo[key] = assignment
-        return assignment
-
-    if any(is_unsatisfied(clause, assignment) for clause in clauses):
-        memo[key] = None
-        return None
-
-    # Pure literal elimination
-    all_literals = {lit for clause in clauses for lit in clause}
-    pure_literals = {lit for lit in all_literals if -lit not in all_literals}
-    for lit in pure_literals:
-        assignment[abs(lit)] = lit > 0
-
-    # First Unit Propagation Attempt
-    def process_unit_clauses():
-        while True:
-            unit_clauses = [clause for clause in clauses if sum(1 for lit in clause if abs(lit) not in assignment) == 1]
-            if not unit_clauses:
+from array import array
+from functools import lru_cache
+from itertools import accumulate
+
+try:
+    import numpy as np
+    from numba import njit
+except ImportError:
+    np = None
+
+    def njit(*args, **kwargs):
+        """Stand-in for numba.njit that leaves the kernel as plain Python."""
+        return lambda func: func
+
+try:
+    from pysat.solvers import Glucose3
+except ImportError:
+    Glucose3 = None
+
+def compile_clauses(clauses):
+    """Map variable ids onto dense indices 0..n-1 and encode each clause as a list of literal codes.
+
+    The literal on variable index v is coded 2 * v when positive and 2 * v + 1 when negated, so
+    lit >> 1 is its variable, lit & 1 its sign and lit ^ 1 its negation.
+    """
+    variables = sorted({abs(lit) for clause in clauses for lit in clause})
+    index = {var: i for i, var in enumerate(variables)}
+    compiled = []
+    for clause in clauses:
+        codes = list(dict.fromkeys(2 * index[lit] if lit > 0 else 2 * index[-lit] + 1 for lit in clause))
+        if any(lit ^ 1 in codes for lit in codes):
+            continue  # Tautologies are satisfied by every assignment
+        compiled.append(codes)
+    return variables, compiled
+
+def int_array(values):
+    return np.array(values, dtype=np.int32) if np is not None else array('i', values)
+
+def byte_array(size):
+    return np.zeros(size, dtype=np.uint8) if np is not None else bytearray(size)
+
+# Kernels over the flat clause arrays; compiled by Numba when it is installed
+
+@njit(cache=True, boundscheck=False)
+def propagate(lit_data, clause_offsets, watch_lit, watch_next, watch_head, assigned, value, trail, trail_len, lit):
+    """Make lit true and follow every implication through the watch lists; return (ok, trail_len)."""
+    v = lit >> 1
+    if assigned[v]:
+        return value[v] != (lit & 1), trail_len
+    assigned[v] = 1
+    value[v] = (lit & 1) ^ 1
+    trail[trail_len] = lit
+    qhead = trail_len
+    trail_len += 1
+
+    while qhead < trail_len:
+        # Only clauses watching the literal that just became false need to be looked at
+        false_lit = trail[qhead] ^ 1
+        qhead += 1
+        prev = -1
+        w = watch_head[false_lit]
+        while w != -1:
+            nxt = watch_next[w]
+            ci = w >> 1
+            other = watch_lit[w ^ 1]
+            ov = other >> 1
+            if assigned[ov] and value[ov] != (other & 1):
+                prev = w
+                w = nxt
+                continue
+
+            replacement = -1
+            for k in range(clause_offsets[ci], clause_offsets[ci + 1]):
+                candidate = lit_data[k]
+                if candidate != false_lit and candidate != other:
+                    cv = candidate >> 1
+                    if not assigned[cv] or value[cv] != (candidate & 1):
+                        replacement = candidate
+                        break
+
+            if replacement != -1:
+                # Move this watch slot from false_lit's chain onto the replacement's
+                if prev == -1:
+                    watch_head[false_lit] = nxt
+                else:
+                    watch_next[prev] = nxt
+                watch_lit[w] = replacement
+                watch_next[w] = watch_head[replacement]
+                watch_head[replacement] = w
+                w = nxt
+                continue
+
+            if assigned[ov]:
+                return False, trail_len  # Every literal of the clause is false
+            # Unit: the other watch is the only literal left
+            assigned[ov] = 1
+            value[ov] = (other & 1) ^ 1
+            trail[trail_len] = other
+            trail_len += 1
+            prev = w
+            w = nxt
+    return True, trail_len
+
+@njit(cache=True, boundscheck=False)
+def mark_satisfied(lit_data, clause_offsets, occ_data, occ_offsets, trail, start, stop, sat_count, open_occ):
+    """Count the literals trail[start:stop] as true in every clause they occur in; return how many clauses that satisfied."""
+    satisfied = 0
+    for i in range(start, stop):
+        lit = trail[i]
+        for k in range(occ_offsets[lit], occ_offsets[lit + 1]):
+            ci = occ_data[k]
+            sat_count[ci] += 1
+            if sat_count[ci] == 1:
+                # The clause just closed, so its literals no longer occur in an open clause
+                satisfied += 1
+                for m in range(clause_offsets[ci], clause_offsets[ci + 1]):
+                    open_occ[lit_data[m]] -= 1
+    return satisfied
+
+@njit(cache=True, boundscheck=False)
+def unmark_satisfied(lit_data, clause_offsets, occ_data, occ_offsets, trail, start, stop, sat_count, open_occ):
+    """Take back mark_satisfied over trail[start:stop]; return how many clauses that reopened."""
+    reopened = 0
+    for i in range(start, stop):
+        lit = trail[i]
+        for k in range(occ_offsets[lit], occ_offsets[lit + 1]):
+            ci = occ_data[k]
+            sat_count[ci] -= 1
+            if sat_count[ci] == 0:
+                reopened += 1
+                for m in range(clause_offsets[ci], clause_offsets[ci + 1]):
+                    open_occ[lit_data[m]] += 1
+    return reopened
+
+@njit(cache=True, boundscheck=False)
+def assign_pure_literals(open_occ, assigned, value, trail, trail_len):
+    """Assign every free variable that occurs in open clauses in only one polarity; return (a variable occurring in both or -1, trail_len)."""
+    variable = -1
+    for v in range(len(assigned)):
+        if assigned[v]:
+            continue
+        pos = 1 if open_occ[2 * v] else 0
+        neg = 1 if open_occ[2 * v + 1] else 0
+        if pos != neg:
+            # A pure literal never falsifies an open clause, so the watches stay valid without propagating
+            assigned[v] = 1
+            value[v] = pos
+            trail[trail_len] = 2 * v + neg
+            trail_len += 1
+        elif pos and variable == -1:
+            variable = v
+    return variable, trail_len
+
+@njit(cache=True, boundscheck=False)
+def undo_trail(trail, start, trail_len, assigned):
+    for i in range(start, trail_len):
+        assigned[trail[i] >> 1] = 0
+
+@lru_cache(maxsize=None)
+def solve(clauses_frozen, assigned_mask=0, value_mask=0):
+    """Search a frozenset of frozenset clauses from the seed assignment given as bitmasks over variable ids.
+
+    Depends on nothing but its arguments, so results are cached per formula and seed; the model comes
+    back as a tuple of (variable, value) pairs, or None when the formula is unsatisfiable.
+    """
+    variables, compiled = compile_clauses(clauses_frozen)
+    if any(not clause for clause in compiled):
+        return None  # An empty clause can never be satisfied
+
+    nvars = len(variables)
+    lit_data = int_array([lit for clause in compiled for lit in clause])
+    clause_offsets = int_array([0] + list(accumulate(len(clause) for clause in compiled)))
+
+    # The clauses each literal occurs in, flattened the same way, so an assignment only visits its own clauses
+    occurrences = [[] for _ in range(2 * nvars)]
+    for ci, clause in enumerate(compiled):
+        for lit in clause:
+            occurrences[lit].append(ci)
+    occ_data = int_array([ci for occ in occurrences for ci in occ])
+    occ_offsets = int_array([0] + list(accumulate(len(occ) for occ in occurrences)))
+
+    # Clause ci watches two literals in slots 2 * ci and 2 * ci + 1, each slot chained into its literal's list
+    # through watch_next; a unit clause watches its only literal in both slots but links just the first
+    watch_lit = [lit for clause in compiled for lit in (clause[0], clause[-1])]
+    watch_next = [-1] * len(watch_lit)
+    watch_head = [-1] * (2 * nvars)
+    for w, lit in enumerate(watch_lit):
+        if w & 1 and len(compiled[w >> 1]) == 1:
+            continue
+        watch_next[w] = watch_head[lit]
+        watch_head[lit] = w
+    watch_lit, watch_next, watch_head = int_array(watch_lit), int_array(watch_next), int_array(watch_head)
+
+    assigned = byte_array(nvars)
+    value = byte_array(nvars)
+    trail = int_array([0] * nvars)  # Literals in the order they were made true
+    trail_len = 0
+    marked = 0  # Trail entries already counted into sat_count
+    sat_count = int_array([0] * len(compiled))  # True literals per clause, as of trail[:marked]
+    open_occ = int_array([len(occ) for occ in occurrences])  # Unsatisfied clauses containing each literal
+    open_clauses = len(compiled)
+    decision_levels = []  # (trail length before the decision, decided literal) per level
+
+    def decide(lit):
+        nonlocal trail_len
+        ok, trail_len = propagate(lit_data, clause_offsets, watch_lit, watch_next, watch_head, assigned, value, trail, trail_len, lit)
+        return ok
+
+    queue = [clause[0] for clause in compiled if len(clause) == 1]
+    for i, var in enumerate(variables):
+        if assigned_mask >> var & 1:
+            queue.append(2 * i if value_mask >> var & 1 else 2 * i + 1)
+    ok = all(decide(lit) for lit in queue)
+
+    while True:
+        if ok:
+            open_clauses -= mark_satisfied(lit_data, clause_offsets, occ_data, occ_offsets, trail, marked, trail_len, sat_count, open_occ)
+            marked = trail_len
+            variable = -1
+            if open_clauses:
+                variable, trail_len = assign_pure_literals(open_occ, assigned, value, trail, trail_len)
+
+            if variable == -1:
+                # Every open clause held a pure literal
+                return tuple((variables[v], bool(value[v])) for v in range(nvars) if assigned[v])
+
+            # Decide: try the variable True first
+            decision_levels.append((trail_len, 2 * variable))
+            ok = decide(2 * variable)
+            continue
+
+        # Conflict: undo back to the most recent decision whose False branch is still untried
+        while decision_levels:
+            start, lit = decision_levels.pop()
+            undo_trail(trail, start, trail_len, assigned)
+            if marked > start:
+                open_clauses += unmark_satisfied(lit_data, clause_offsets, occ_data, occ_offsets, trail, start, marked, sat_count, open_occ)
+                marked = start
+            trail_len = start
+            if not lit & 1:
+                decision_levels.append((start, lit ^ 1))
+                ok = decide(lit ^ 1)
                 break
-            for unit_clause in unit_clauses:
-                unit_lit = next((lit for lit in unit_clause if abs(lit) not in assignment), None)
-                if unit_lit is None:
-                    continue  # Skip if no valid literal found
-                assignment[abs(unit_lit)] = unit_lit > 0
-                new_clauses = []
-                for clause in clauses:
-                    if not is_satisfied(clause, assignment):
-                        # Remove the assigned literal and add clause if still relevant
-                        new_clause = [lit for lit in clause if abs(lit) != abs(unit_lit)]
-                        if new_clause:
-                            new_clauses.append(new_clause)
-                clauses[:] = new_clauses
-                # Exit if any clause is unsatisfied after assignment
-                if any(is_unsatisfied(clause, assignment) for clause in clauses):
-                    return False
-        return True
-
-    # Process unit clauses and handle conflicts early
-    if not process_unit_clauses():
-        memo[key] = None
-        return None
-
-    # If the initial unit propagation failed, apply the second unit clause logic as a last resort
-    def process_unit_clauses_fallback():
-        unit_clauses = [clause for clause in clauses if sum(1 for lit in clause if abs(lit) not in assignment) == 1]
-        for unit_clause in unit_clauses:
-            unit_lit = next((lit for lit in unit_clause if abs(lit) not in assignment), None)
-            if unit_lit is not None:
-                assignment[abs(unit_lit)] = unit_lit > 0
-                new_clauses = []
-                for clause in clauses:
-                    if not is_satisfied(clause, assignment):
-                        new_clause = [lit for lit in clause if abs(lit) != abs(unit_lit)]
-                        if new_clause:
-                            new_clauses.append(new_clause)
-                clauses[:] = new_clauses
-        return True
-
-    # Fallback to second unit clause processing after failing to make progress with initial propagation
-    if not process_unit_clauses_fallback():
-        memo[key] = None
-        return None
-
-    # Select an unassigned variable for backtracking
-    unassigned_vars = {abs(lit) for clause in clauses for lit in clause if abs(lit) not in assignment}
-    if not unassigned_vars:
-        memo[key] = None
-        return None
-
-    variable = unassigned_vars.pop()
-    for value in [True, False]:
-        result = dpll(clauses, {**assignment, variable: value})
-        if result is not None:
-            memo[key] = result
-            return result
-
-    memo[key] = None
-    return None
+        else:
+            return None
+
+def dpll(clauses, assigned=0, value=0):
+    """Solve from a seed given as bitmasks over variable ids: assigned marks the fixed variables, value the True ones."""
+    model = solve(frozenset(frozenset(clause) for clause in clauses), assigned, value)
+    return None if model is None else dict(model)
+
+def solve_sat(clauses):
+    """Solve with PySAT's Glucose3 (CDCL) when it is installed, otherwise with the pure-Python dpll."""
+    if Glucose3 is None:
+        return dpll(clauses)
+    with Glucose3(bootstrap_with=clauses) as solver:
+        if not solver.solve():
+            return None
+        model = solver.get_model()
+    # The model covers every id up to the largest one; keep only the variables the clauses mention
+    variables = {abs(lit) for clause in clauses for lit in clause}
+    return {abs(lit): lit > 0 for lit in model if abs(lit) in variables}
 
 def run_tests():
     test_cases = [
         ([[1, -2], [2, 3], [-1, -3]], True),
         ([[1], [-1]], False),
-        ([[1, 2], [-1, -2]], False),
-        ([[1, 2], [1, -2], [-1, 2], [-1, -2]], True),
+        ([[1, 2], [-1, -2]], True),
+        ([[1, 2], [1, -2], [-1, 2], [-1, -2]], False),
         ([[1, 2, 3], [-1, -2], [2, -3], [-2, 3]], True)
     ]
+    # (clauses, assigned, value, expected) for dpll seeded through bitmasks over variable ids
+    seeded_cases = [
+        ([[1, -2], [2, 3], [-1, -3]], 1 << 1, 0, True),
+        ([[1, -2], [2, 3], [-1, -3]], 1 << 1 | 1 << 3, 1 << 1 | 1 << 3, False)
+    ]
 
     results = []
     for i, (clauses, expected) in enumerate(test_cases):
-        memo.clear()  # Clear memoization before each test
-        result = dpll(clauses) is not None
-        passed = result == expected
+        # solve_sat hands off to Glucose3 when PySAT is installed, so check dpll on its own as well
+        passed = (dpll(clauses) is not None) == expected and (solve_sat(clauses) is not None) == expected
         results.append(f"Test {i + 1}: {'Pass' if passed else 'Fail'}")
-        if not passed:
-            print(f"Test {i + 1} failed. Retesting with fallback unit clause processing...")
-            # Apply the assignment recursive calls only on failures
-            def retry_dpll(clauses, assignment={}):
-                key = tuple(sorted(assignment.items()))
-                if key in memo:
-                    return memo[key]
-
-                def is_satisfied(clause):
-                    return any((lit > 0 and assignment.get(abs(lit), False)) or (lit < 0 and not assignment.get(abs(lit), False)) for lit in clause)
-
-                def is_unsatisfied(clause):
-                    return all((lit > 0 and not assignment.get(abs(lit), True)) or (lit < 0 and assignment.get(abs(lit), False)) for lit in clause)
-
-                if all(is_satisfied(clause) for clause in clauses):
-                    memo[key] = assignment
-                    return assignment
-
-                if any(is_unsatisfied(clause) for clause in clauses):
-                    memo[key] = None
-                    return None
-
-                # Pure literal elimination
-                pure_literals = set()
-                all_literals = {lit for clause in clauses for lit in clause}
-                for lit in all_literals:
-                    if -lit not in all_literals:
-                        pure_literals.add(lit)
-                
-                for lit in pure_literals:
-                    assignment[abs(lit)] = lit > 0
-
-                # Primary Unit Clause Processing
-                def process_unit_clauses_primary():
-                    while True:
-                        unit_clauses = [clause for clause in clauses if sum(1 for lit in clause if abs(lit) not in assignment) == 1]
-                        if not unit_clauses:
-                            break
-                        for unit_clause in unit_clauses:
-                            unit_lit = next((lit for lit in unit_clause if abs(lit) not in assignment), None)
-                            if unit_lit is None:
-                                continue  # Skip if no valid literal found
-                            assignment[abs(unit_lit)] = unit_lit > 0
-                            new_clauses = []
-                            for clause in clauses:
-                                if not is_satisfied(clause, assignment):
-                                    # Remove the assigned literal and add clause if still relevant
-                                    new_clause = [lit for lit in clause if abs(lit) != abs(unit_lit)]
-                                    if new_clause:
-                                        new_clauses.append(new_clause)
-                            clauses[:] = new_clauses
-                            # Exit if any clause is unsatisfied after assignment
-                            if any(is_unsatisfied(clause, assignment) for clause in clauses):
-                                return False
-                    return True
-
-                if not process_unit_clauses_primary():
-                    memo[key] = None
-                    return None
-
-                # Fallback Unit Clause Processing
-                def process_unit_clauses_fallback():
-                    unit_clauses = [clause for clause in clauses if sum(1 for lit in clause if abs(lit) not in assignment) == 1]
-                    while unit_clauses:
-                        unit_clause = unit_clauses.pop()
-                        unit_lit = next((lit for lit in unit_clause if abs(lit) not in assignment), None)
-                        if unit_lit is None:
-                            continue
-                        assignment[abs(unit_lit)] = unit_lit > 0
-                        clauses[:] = [clause for clause in clauses if not is_satisfied(clause, assignment)]
-                        unit_clauses = [clause for clause in clauses if sum(1 for lit in clause if abs(lit) not in assignment) == 1]
-                    return None
-
-                if not process_unit_clauses_fallback():
-                    memo[key] = None
-                    return None
-
-                # Choose the first unassigned variable
-                unassigned_vars = {abs(lit) for clause in clauses for lit in clause if abs(lit) not in assignment}
-                if not unassigned_vars:
-                    memo[key] = None
-                    return None
-
-                variable = unassigned_vars.pop()
-                for value in [True, False]:
-                    result = retry_dpll(clauses, {**assignment, variable: value})
-                    if result is not None:
-                        memo[key] = result
-                        return result
-                memo[key] = None
-                return None
-
-            retry_result = retry_dpll(clauses) is not None
-            results[-1] = f"Test {i + 1}: {'Pass' if retry_result == expected else 'Fail'}"
+    for clauses, assigned, value, expected in seeded_cases:
+        passed = (dpll(clauses, assigned, value) is not None) == expected
+        results.append(f"Test {len(results) + 1}: {'Pass' if passed else 'Fail'}")
     return " | ".join(results)
 
-results = run_tests()
-print(results)
\ No newline at end of file
+# Numba loads cached kernels by importing this file under its module name, so only run the tests
+# when executed as a script
+if __name__ == "__main__":
+    results = run_tests()
+    print(results)
\ No newline at end of file
@@ -1,83 +1,248 @@
-import math
 import time
+from array import array
+from functools import lru_cache
+from itertools import accumulate
 
-# TSP-related functions
-def calculate_distance(city1, city2):
-    return math.hypot(city1['x'] - city2['x'], city1['y'] - city2['y'])
-
-def total_distance(path):
-    return sum(calculate_distance(path[i], path[(i + 1) % len(path)]) for i in range(len(path)))
-
-def morton_order(city):
-    def interleave_bits(x, y):
-        def spread_bits(v):
-            v = (v | (v << 8)) & 0x00FF00FF
-            v = (v | (v << 4)) & 0x0F0F0F0F
-            v = (v | (v << 2)) & 0x33333333
-            v = (v | (v << 1)) & 0x55555555
-            return v
-        return spread_bits(x) | (spread_bits(y) << 1)
-    x = int(city['x'] * 10000)
-    y = int(city['y'] * 10000)
-    return interleave_bits(x, y)
-
-def solve_tsp(cities):
-    """Find and optimize a path using Morton order, nearest neighbor heuristic, and 2-opt algorithm."""
-    
-    # Sort cities based on Morton order
-    cities_sorted = sorted(cities, key=morton_order)
+import numpy as np
 
-    # Measure time for initial solution using nearest neighbor heuristic
-    start_initial = time.time()
-    
-    # Nearest neighbor heuristic and path initialization
-    unvisited = set(city['name'] for city in cities_sorted)
-    path = [cities_sorted[0]]
-    current_city = cities_sorted[0]
-
-    while unvisited:
-        unvisited.discard(current_city['name'])
-        closest = min((city for city in cities_sorted if city['name'] in unvisited), 
-                      key=lambda city: calculate_distance(current_city, city), 
-                      default=None)
-        if closest is None:
-            break
+try:
+    from numba import njit
+    HAVE_NUMBA = True
+except ImportError:
+    HAVE_NUMBA = False
 
-        path.append(closest)
-        current_city = closest
+    def njit(*args, **kwargs):
+        """Stand-in for numba.njit that leaves the kernel as plain Python."""
+        return lambda func: func
 
-    # Ensure path returns to start to form a complete tour
-    path.append(path[0])
-    initial_distance = total_distance(path)
-    end_initial = time.time()
-    initial_time = round((end_initial - start_initial) * 1000, 2)  # Convert to milliseconds and round to 2 decimal places
+try:
+    from scipy.spatial import cKDTree
+except ImportError:
+    cKDTree = None
 
-    # Measure time for optimizing the path using 2-opt
-    start_optimized = time.time()
-    
-    # 2-opt optimization
-    improvement_threshold = 1e-6
-    improved = True
+try:
+    from pysat.solvers import Glucose3
+except ImportError:
+    Glucose3 = None
 
+# TSP-related functions
+def squared_distances(xy, i, others):
+    """Squared Euclidean distances from city i to each city in others; enough wherever only the order matters."""
+    dx = xy[others, 0] - xy[i, 0]
+    dy = xy[others, 1] - xy[i, 1]
+    return dx * dx + dy * dy
+
+def distance_matrix(xy):
+    """Pairwise Euclidean distances between the rows of an (n, 2) coordinate array."""
+    # Planar city coordinates cannot overflow, so skip hypot's rescaling
+    dx = xy[:, None, 0] - xy[None, :, 0]
+    dy = xy[:, None, 1] - xy[None, :, 1]
+    return np.sqrt(dx * dx + dy * dy)
+
+def total_distance(path, D):
+    """Length of the closed tour through the city indices in path."""
+    path = np.asarray(path)
+    return float(D[path, np.roll(path, -1)].sum())
+
+def morton_order(xy):
+    """Indices that sort the rows of an (n, 2) coordinate array by Morton (Z-order) key."""
+    def spread_bits(v):
+        v = (v | (v << 8)) & 0x00FF00FF
+        v = (v | (v << 4)) & 0x0F0F0F0F
+        v = (v | (v << 2)) & 0x33333333
+        v = (v | (v << 1)) & 0x55555555
+        return v
+    # Truncate like int() and interleave the bits of every city's x and y in one pass over the columns
+    scaled = (xy * 10000).astype(np.int64)
+    keys = spread_bits(scaled[:, 0]) | (spread_bits(scaled[:, 1]) << 1)
+    return np.argsort(keys, kind='stable')
+
+def nearest_neighbor_path(xy):
+    """Greedy nearest-neighbor ordering of the cities in xy, starting from city 0."""
+    n = len(xy)
+    visited = np.zeros(n, dtype=bool)
+    visited[0] = True
+    path = [0]
+    if cKDTree is None:
+        # Compare squared distances to the unvisited cities; argmin keeps the first of equally close ones
+        for _ in range(n - 1):
+            cand = np.flatnonzero(~visited)
+            closest = int(cand[np.argmin(squared_distances(xy, path[-1], cand))])
+            visited[closest] = True
+            path.append(closest)
+        return path
+
+    tree = cKDTree(xy)
+    for _ in range(n - 1):
+        # Widen the query until it reaches an unvisited city and every city tied with it
+        k = min(8, n)
+        while True:
+            dd, ii = tree.query(xy[path[-1]], k=k)
+            free = ~visited[ii]
+            if free.any():
+                best = dd[free].min()
+                if k == n or dd[-1] > best:
+                    break
+            k = min(2 * k, n)
+        closest = int(ii[free & (dd == best)].min())
+        visited[closest] = True
+        path.append(closest)
+    return path
+
+def neighbor_lists(xy, D, k):
+    """The k nearest other cities of every city, closest first, as an (n, k) index array."""
+    if cKDTree is not None:
+        nbrs = cKDTree(xy).query(xy, k=k + 1)[1][:, 1:]
+    else:
+        far = D.copy()
+        np.fill_diagonal(far, np.inf)
+        nbrs = np.argsort(far, axis=1, kind='stable')[:, :k]
+    # Contiguous int64 either way, to match the signature two_opt is compiled for
+    return np.ascontiguousarray(nbrs, dtype=np.int64)
+
+@njit(cache=True)
+def reverse_segment(tour, pos, i, j):
+    """Reverse tour[i..j] of the cyclic tour in place, wrapping past the end, and keep pos in step."""
+    n = len(tour)
+    length = (j - i) % n + 1
+    if 2 * length > n:
+        # Reversing the rest of the cycle gives the same tour and moves fewer cities
+        i, j = (j + 1) % n, (i - 1) % n
+        length = n - length
+    if i <= j:
+        # The segment does not wrap, so swap from both ends without any index arithmetic
+        while i < j:
+            t = tour[i]
+            tour[i] = tour[j]
+            tour[j] = t
+            pos[tour[i]] = i
+            pos[t] = j
+            i += 1
+            j -= 1
+        return
+    for _ in range(length // 2):
+        tour[i], tour[j] = tour[j], tour[i]
+        pos[tour[i]] = i
+        pos[tour[j]] = j
+        i = (i + 1) % n
+        j = (j - 1) % n
+
+# Compiled eagerly for the arrays solve_tsp passes, so the first call does no compiling inside a timed run
+@njit('void(int64[::1], int64[::1], int64[:, ::1], float64[:, ::1], float64)', cache=True)
+def two_opt(tour, pos, nbrs, D, improvement_threshold):
+    """Apply improving 2-opt moves to the cyclic tour in place until none is left.
+
+    Only moves that give a city a new edge to one of its nearest neighbors in nbrs are tried, and a
+    city's don't-look bit skips it until a move changes one of its edges. pos maps each city to its
+    index in tour. D is indexed as D[a][b] so the same code runs compiled on arrays or as Python on lists.
+    """
+    n = len(tour)
+    dont_look = [False] * n
+    improved = True
     while improved:
         improved = False
-        for i in range(1, len(path) - 2):
-            for j in range(i + 1, len(path) - 1):
-                if calculate_distance(path[i - 1], path[i]) + calculate_distance(path[j], path[(j + 1) % len(path)]) > \
-                   calculate_distance(path[i - 1], path[j]) + calculate_distance(path[i], path[(j + 1) % len(path)]):
-                    path[i:j + 1] = reversed(path[i:j + 1])
-                    improved = True
+        for a in range(n):
+            if dont_look[a]:
+                continue
+            moved = False
+            # Try replacing the edge to a's successor, then the edge to its predecessor
+            for step in (1, -1):
+                b = tour[(pos[a] + step) % n]
+                d_ab = D[a][b]
+                for t in range(len(nbrs[a])):
+                    c = nbrs[a][t]
+                    gain = d_ab - D[a][c]
+                    if gain <= improvement_threshold:
+                        break  # Neighbors are sorted, so no closer c is left to make a shorter edge
+                    if c == a or c == b:
+                        continue
+                    d = tour[(pos[c] + step) % n]
+                    if d == a:
+                        continue
+                    if gain + D[c][d] - D[b][d] > improvement_threshold:
+                        # Swap edges (a, b), (c, d) for (a, c), (b, d)
+                        if step == 1:
+                            reverse_segment(tour, pos, pos[b], pos[c])
+                        else:
+                            reverse_segment(tour, pos, pos[a], pos[d])
+                        dont_look[b] = False
+                        dont_look[c] = False
+                        dont_look[d] = False
+                        moved = True
+                        break
+                if moved:
+                    break
+            if moved:
+                improved = True
+            else:
+                dont_look[a] = True
+
+def solve_tsp(cities, profile=False):
+    """Find and optimize a path using Morton order, nearest neighbor heuristic, and 2-opt algorithm.
+
+    With profile=True the nearest neighbor and 2-opt phases are timed and reported in milliseconds;
+    otherwise both times are None.
+    """
+
+    # Split the city dicts into names and an (n, 2) coordinate array; everything below works on indices
+    names = [city['name'] for city in cities]
+    xy = np.array([[city['x'], city['y']] for city in cities], dtype=float)
+    n = len(names)
+
+    # Sort cities based on Morton order, so that index order is Morton order from here on
+    order = morton_order(xy)
+    names = [names[i] for i in order]
+    xy = xy[order]
 
-    optimized_distance = total_distance(path)
-    end_optimized = time.time()
-    optimized_time = round((end_optimized - start_optimized) * 1000, 2)  # Convert to milliseconds and round to 2 decimal places
+    # Measure time for initial solution using nearest neighbor heuristic
+    initial_time_ns = optimized_time_ns = None
+    if profile:
+        start_initial = time.perf_counter_ns()
+
+    D = distance_matrix(xy)
+
+    # Nearest neighbor heuristic and path initialization, using a KD-tree when SciPy is available
+    path_idx = nearest_neighbor_path(xy)
+
+    # Ensure path returns to start to form a complete tour
+    path_idx.append(path_idx[0])
+    initial_path = [names[i] for i in path_idx]
+    initial_distance = total_distance(path_idx, D)
+    if profile:
+        initial_time_ns = time.perf_counter_ns() - start_initial
+
+        # Measure time for optimizing the path using 2-opt
+        start_optimized = time.perf_counter_ns()
+    
+    # 2-opt optimization over the 20 nearest neighbors of each city; a triangle has no improving move
+    improvement_threshold = 1e-6
+    if n > 3:
+        nbrs = neighbor_lists(xy, D, min(20, n - 1))
+        tour = path_idx[:-1]
+        if HAVE_NUMBA:
+            tour = np.array(tour, dtype=np.int64)
+            pos = np.empty(n, dtype=np.int64)
+            pos[tour] = np.arange(n)
+            two_opt(tour, pos, nbrs, D, improvement_threshold)
+            tour = tour.tolist()
+        else:
+            # Nested lists index faster than ndarrays inside an interpreted loop
+            pos = [0] * n
+            for i, city in enumerate(tour):
+                pos[city] = i
+            two_opt(tour, pos, nbrs.tolist(), D.tolist(), improvement_threshold)
+        # Rotate the cycle back to start and end at the first city
+        start = tour.index(path_idx[0])
+        path_idx = tour[start:] + tour[:start] + [path_idx[0]]
+
+    optimized_distance = total_distance(path_idx, D)
+    if profile:
+        optimized_time_ns = time.perf_counter_ns() - start_optimized
 
     # Validation checks
-    unique_cities = {city['name'] for city in path}
-    all_cities = {city['name'] for city in cities}
-    is_valid_path = unique_cities == all_cities and path[0] == path[-1]
+    is_valid_path = sorted(path_idx[:-1]) == list(range(n)) and path_idx[0] == path_idx[-1]
 
-    optimized_array = [{'name': city['name'], 'x': city['x'], 'y': city['y']} for city in path]
+    optimized_array = [{'name': names[i], 'x': float(xy[i, 0]), 'y': float(xy[i, 1])} for i in path_idx]
 
     if is_valid_path:
         print("Path validation successful: Each city is visited once, and path returns to origin.")
@@ -85,255 +250,318 @@ def solve_tsp(cities):
         print("Path validation failed: Path does not include all cities or does not return to the origin.")
 
     return {
-        'initial_path': [city['name'] for city in path],
-        'optimized_path': [city['name'] for city in path],
+        'initial_path': initial_path,
+        'optimized_path': [names[i] for i in path_idx],
         'initial_distance': initial_distance,
         'optimized_distance': optimized_distance,
-        'initial_time': initial_time,
-        'optimized_time': optimized_time,
+        'initial_time': None if initial_time_ns is None else initial_time_ns / 1e6,  # Nanoseconds to milliseconds
+        'optimized_time': None if optimized_time_ns is None else optimized_time_ns / 1e6,
         'optimized_array': optimized_array
     }
 
 # SAT Solver-related functions
-memo = {}
-
-def is_satisfied(clause, assignment):
-    return any((lit > 0 and assignment.get(abs(lit), False)) or (lit < 0 and not assignment.get(abs(lit), False)) for lit in clause)
-
-def is_unsatisfied(clause, assignment):
-    return all((lit > 0 and not assignment.get(abs(lit), True)) or (lit < 0 and assignment.get(abs(lit), False)) for lit in clause)
-
-def dpll(clauses, assignment={}):
-    key = tuple(sorted(assignment.items()))
-    if key in memo:
-        return memo[key]
-
-    if all(is_satisfied(clause, assignment) for clause in clauses):
-        memo[key] = assignment
-        return assignment
-
-    if any(is_unsatisfied(clause, assignment) for clause in clauses):
-        memo[key] = None
-        return None
-
-    # Pure literal elimination
-    all_literals = {lit for clause in clauses for lit in clause}
-    pure_literals = {lit for lit in all_literals if -lit not in all_literals}
-    for lit in pure_literals:
-        assignment[abs(lit)] = lit > 0
-
-    # First Unit Propagation Attempt
-    def process_unit_clauses():
-        while True:
-            unit_clauses = [clause for clause in clauses if sum(1 for lit in clause if abs(lit) not in assignment) == 1]
-            if not unit_clauses:
+def compile_clauses(clauses):
+    """Map variable ids onto dense indices 0..n-1 and encode each clause as a list of literal codes.
+
+    The literal on variable index v is coded 2 * v when positive and 2 * v + 1 when negated, so
+    lit >> 1 is its variable, lit & 1 its sign and lit ^ 1 its negation.
+    """
+    variables = sorted({abs(lit) for clause in clauses for lit in clause})
+    index = {var: i for i, var in enumerate(variables)}
+    compiled = []
+    for clause in clauses:
+        codes = list(dict.fromkeys(2 * index[lit] if lit > 0 else 2 * index[-lit] + 1 for lit in clause))
+        if any(lit ^ 1 in codes for lit in codes):
+            continue  # Tautologies are satisfied by every assignment
+        compiled.append(codes)
+    return variables, compiled
+
+def int_array(values):
+    return np.array(values, dtype=np.int32) if HAVE_NUMBA else array('i', values)
+
+def byte_array(size):
+    return np.zeros(size, dtype=np.uint8) if HAVE_NUMBA else bytearray(size)
+
+# Kernels over the flat clause arrays; compiled by Numba when it is installed
+
+@njit(cache=True, boundscheck=False)
+def propagate(lit_data, clause_offsets, watch_lit, watch_next, watch_head, assigned, value, trail, trail_len, lit):
+    """Make lit true and follow every implication through the watch lists; return (ok, trail_len)."""
+    v = lit >> 1
+    if assigned[v]:
+        return value[v] != (lit & 1), trail_len
+    assigned[v] = 1
+    value[v] = (lit & 1) ^ 1
+    trail[trail_len] = lit
+    qhead = trail_len
+    trail_len += 1
+
+    while qhead < trail_len:
+        # Only clauses watching the literal that just became false need to be looked at
+        false_lit = trail[qhead] ^ 1
+        qhead += 1
+        prev = -1
+        w = watch_head[false_lit]
+        while w != -1:
+            nxt = watch_next[w]
+            ci = w >> 1
+            other = watch_lit[w ^ 1]
+            ov = other >> 1
+            if assigned[ov] and value[ov] != (other & 1):
+                prev = w
+                w = nxt
+                continue
+
+            replacement = -1
+            for k in range(clause_offsets[ci], clause_offsets[ci + 1]):
+                candidate = lit_data[k]
+                if candidate != false_lit and candidate != other:
+                    cv = candidate >> 1
+                    if not assigned[cv] or value[cv] != (candidate & 1):
+                        replacement = candidate
+                        break
+
+            if replacement != -1:
+                # Move this watch slot from false_lit's chain onto the replacement's
+                if prev == -1:
+                    watch_head[false_lit] = nxt
+                else:
+                    watch_next[prev] = nxt
+                watch_lit[w] = replacement
+                watch_next[w] = watch_head[replacement]
+                watch_head[replacement] = w
+                w = nxt
+                continue
+
+            if assigned[ov]:
+                return False, trail_len  # Every literal of the clause is false
+            # Unit: the other watch is the only literal left
+            assigned[ov] = 1
+            value[ov] = (other & 1) ^ 1
+            trail[trail_len] = other
+            trail_len += 1
+            prev = w
+            w = nxt
+    return True, trail_len
+
+@njit(cache=True, boundscheck=False)
+def mark_satisfied(lit_data, clause_offsets, occ_data, occ_offsets, trail, start, stop, sat_count, open_occ):
+    """Count the literals trail[start:stop] as true in every clause they occur in; return how many clauses that satisfied."""
+    satisfied = 0
+    for i in range(start, stop):
+        lit = trail[i]
+        for k in range(occ_offsets[lit], occ_offsets[lit + 1]):
+            ci = occ_data[k]
+            sat_count[ci] += 1
+            if sat_count[ci] == 1:
+                # The clause just closed, so its literals no longer occur in an open clause
+                satisfied += 1
+                for m in range(clause_offsets[ci], clause_offsets[ci + 1]):
+                    open_occ[lit_data[m]] -= 1
+    return satisfied
+
+@njit(cache=True, boundscheck=False)
+def unmark_satisfied(lit_data, clause_offsets, occ_data, occ_offsets, trail, start, stop, sat_count, open_occ):
+    """Take back mark_satisfied over trail[start:stop]; return how many clauses that reopened."""
+    reopened = 0
+    for i in range(start, stop):
+        lit = trail[i]
+        for k in range(occ_offsets[lit], occ_offsets[lit + 1]):
+            ci = occ_data[k]
+            sat_count[ci] -= 1
+            if sat_count[ci] == 0:
+                reopened += 1
+                for m in range(clause_offsets[ci], clause_offsets[ci + 1]):
+                    open_occ[lit_data[m]] += 1
+    return reopened
+
+@njit(cache=True, boundscheck=False)
+def assign_pure_literals(open_occ, assigned, value, trail, trail_len):
+    """Assign every free variable that occurs in open clauses in only one polarity; return (a variable occurring in both or -1, trail_len)."""
+    variable = -1
+    for v in range(len(assigned)):
+        if assigned[v]:
+            continue
+        pos = 1 if open_occ[2 * v] else 0
+        neg = 1 if open_occ[2 * v + 1] else 0
+        if pos != neg:
+            # A pure literal never falsifies an open clause, so the watches stay valid without propagating
+            assigned[v] = 1
+            value[v] = pos
+            trail[trail_len] = 2 * v + neg
+            trail_len += 1
+        elif pos and variable == -1:
+            variable = v
+    return variable, trail_len
+
+@njit(cache=True, boundscheck=False)
+def undo_trail(trail, start, trail_len, assigned):
+    for i in range(start, trail_len):
+        assigned[trail[i] >> 1] = 0
+
+@lru_cache(maxsize=None)
+def solve(clauses_frozen, assigned_mask=0, value_mask=0):
+    """Search a frozenset of frozenset clauses from the seed assignment given as bitmasks over variable ids.
+
+    Depends on nothing but its arguments, so results are cached per formula and seed; the model comes
+    back as a tuple of (variable, value) pairs, or None when the formula is unsatisfiable.
+    """
+    variables, compiled = compile_clauses(clauses_frozen)
+    if any(not clause for clause in compiled):
+        return None  # An empty clause can never be satisfied
+
+    nvars = len(variables)
+    lit_data = int_array([lit for clause in compiled for lit in clause])
+    clause_offsets = int_array([0] + list(accumulate(len(clause) for clause in compiled)))
+
+    # The clauses each literal occurs in, flattened the same way, so an assignment only visits its own clauses
+    occurrences = [[] for _ in range(2 * nvars)]
+    for ci, clause in enumerate(compiled):
+        for lit in clause:
+            occurrences[lit].append(ci)
+    occ_data = int_array([ci for occ in occurrences for ci in occ])
+    occ_offsets = int_array([0] + list(accumulate(len(occ) for occ in occurrences)))
+
+    # Clause ci watches two literals in slots 2 * ci and 2 * ci + 1, each slot chained into its literal's list
+    # through watch_next; a unit clause watches its only literal in both slots but links just the first
+    watch_lit = [lit for clause in compiled for lit in (clause[0], clause[-1])]
+    watch_next = [-1] * len(watch_lit)
+    watch_head = [-1] * (2 * nvars)
+    for w, lit in enumerate(watch_lit):
+        if w & 1 and len(compiled[w >> 1]) == 1:
+            continue
+        watch_next[w] = watch_head[lit]
+        watch_head[lit] = w
+    watch_lit, watch_next, watch_head = int_array(watch_lit), int_array(watch_next), int_array(watch_head)
+
+    assigned = byte_array(nvars)
+    value = byte_array(nvars)
+    trail = int_array([0] * nvars)  # Literals in the order they were made true
+    trail_len = 0
+    marked = 0  # Trail entries already counted into sat_count
+    sat_count = int_array([0] * len(compiled))  # True literals per clause, as of trail[:marked]
+    open_occ = int_array([len(occ) for occ in occurrences])  # Unsatisfied clauses containing each literal
+    open_clauses = len(compiled)
+    decision_levels = []  # (trail length before the decision, decided literal) per level
+
+    def decide(lit):
+        nonlocal trail_len
+        ok, trail_len = propagate(lit_data, clause_offsets, watch_lit, watch_next, watch_head, assigned, value, trail, trail_len, lit)
+        return ok
+
+    queue = [clause[0] for clause in compiled if len(clause) == 1]
+    for i, var in enumerate(variables):
+        if assigned_mask >> var & 1:
+            queue.append(2 * i if value_mask >> var & 1 else 2 * i + 1)
+    ok = all(decide(lit) for lit in queue)
+
+    while True:
+        if ok:
+            open_clauses -= mark_satisfied(lit_data, clause_offsets, occ_data, occ_offsets, trail, marked, trail_len, sat_count, open_occ)
+            marked = trail_len
+            variable = -1
+            if open_clauses:
+                variable, trail_len = assign_pure_literals(open_occ, assigned, value, trail, trail_len)
+
+            if variable == -1:
+                # Every open clause held a pure literal
+                return tuple((variables[v], bool(value[v])) for v in range(nvars) if assigned[v])
+
+            # Decide: try the variable True first
+            decision_levels.append((trail_len, 2 * variable))
+            ok = decide(2 * variable)
+            continue
+
+        # Conflict: undo back to the most recent decision whose False branch is still untried
+        while decision_levels:
+            start, lit = decision_levels.pop()
+            undo_trail(trail, start, trail_len, assigned)
+            if marked > start:
+                open_clauses += unmark_satisfied(lit_data, clause_offsets, occ_data, occ_offsets, trail, start, marked, sat_count, open_occ)
+                marked = start
+            trail_len = start
+            if not lit & 1:
+                decision_levels.append((start, lit ^ 1))
+                ok = decide(lit ^ 1)
                 break
-            for unit_clause in unit_clauses:
-                unit_lit = next((lit for lit in unit_clause if abs(lit) not in assignment), None)
-                if unit_lit is None:
-                    continue  # Skip if no valid literal found
-                assignment[abs(unit_lit)] = unit_lit > 0
-                new_clauses = []
-                for clause in clauses:
-                    if not is_satisfied(clause, assignment):
-                        # Remove the assigned literal and add clause if still relevant
-                        new_clause = [lit for lit in clause if abs(lit) != abs(unit_lit)]
-                        if new_clause:
-                            new_clauses.append(new_clause)
-                clauses[:] = new_clauses
-                # Exit if any clause is unsatisfied after assignment
-                if any(is_unsatisfied(clause, assignment) for clause in clauses):
-                    return False
-        return True
-
-    # Process unit clauses and handle conflicts early
-    if not process_unit_clauses():
-        memo[key] = None
-        return None
-
-    # If the initial unit propagation failed, apply the second unit clause logic as a last resort
-    def process_unit_clauses_fallback():
-        unit_clauses = [clause for clause in clauses if sum(1 for lit in clause if abs(lit) not in assignment) == 1]
-        for unit_clause in unit_clauses:
-            unit_lit = next((lit for lit in unit_clause if abs(lit) not in assignment), None)
-            if unit_lit is not None:
-                assignment[abs(unit_lit)] = unit_lit > 0
-                new_clauses = []
-                for clause in clauses:
-                    if not is_satisfied(clause, assignment):
-                        new_clause = [lit for lit in clause if abs(lit) != abs(unit_lit)]
-                        if new_clause:
-                            new_clauses.append(new_clause)
-                clauses[:] = new_clauses
-        return True
-
-    # Fallback to second unit clause processing after failing to make progress with initial propagation
-    if not process_unit_clauses_fallback():
-        memo[key] = None
-        return None
-
-    # Select an unassigned variable for backtracking
-    unassigned_vars = {abs(lit) for clause in clauses for lit in clause if abs(lit) not in assignment}
-    if not unassigned_vars:
-        memo[key] = None
-        return None
-
-    variable = unassigned_vars.pop()
-    for value in [True, False]:
-        result = dpll(clauses, {**assignment, variable: value})
-        if result is not None:
-            memo[key] = result
-            return result
-
-    memo[key] = None
-    return None
+        else:
+            return None
+
+def dpll(clauses, assigned=0, value=0):
+    """Solve from a seed given as bitmasks over variable ids: assigned marks the fixed variables, value the True ones."""
+    model = solve(frozenset(frozenset(clause) for clause in clauses), assigned, value)
+    return None if model is None else dict(model)
+
+def solve_sat(clauses):
+    """Solve with PySAT's Glucose3 (CDCL) when it is installed, otherwise with the pure-Python dpll."""
+    if Glucose3 is None:
+        return dpll(clauses)
+    with Glucose3(bootstrap_with=clauses) as solver:
+        if not solver.solve():
+            return None
+        model = solver.get_model()
+    # The model covers every id up to the largest one; keep only the variables the clauses mention
+    variables = {abs(lit) for clause in clauses for lit in clause}
+    return {abs(lit): lit > 0 for lit in model if abs(lit) in variables}
 
 def run_tests():
     test_cases = [
         ([[1, -2], [2, 3], [-1, -3]], True),
         ([[1], [-1]], False),
-        ([[1, 2], [-1, -2]], False),
-        ([[1, 2], [1, -2], [-1, 2], [-1, -2]], True),
+        ([[1, 2], [-1, -2]], True),
+        ([[1, 2], [1, -2], [-1, 2], [-1, -2]], False),
         ([[1, 2, 3], [-1, -2], [2, -3], [-2, 3]], True)
     ]
+    # (clauses, assigned, value, expected) for dpll seeded through bitmasks over variable ids
+    seeded_cases = [
+        ([[1, -2], [2, 3], [-1, -3]], 1 << 1, 0, True),
+        ([[1, -2], [2, 3], [-1, -3]], 1 << 1 | 1 << 3, 1 << 1 | 1 << 3, False)
+    ]
 
     results = []
     for i, (clauses, expected) in enumerate(test_cases):
-        memo.clear()  # Clear memoization before each test
-        result = dpll(clauses) is not None
-        passed = result == expected
+        # solve_sat hands off to Glucose3 when PySAT is installed, so check dpll on its own as well
+        passed = (dpll(clauses) is not None) == expected and (solve_sat(clauses) is not None) == expected
         results.append(f"Test {i + 1}: {'Pass' if passed else 'Fail'}")
-        if not passed:
-            print(f"Test {i + 1} failed. Retesting with fallback unit clause processing...")
-            # Apply the assignment recursive calls only on failures
-            def retry_dpll(clauses, assignment={}):
-                key = tuple(sorted(assignment.items()))
-                if key in memo:
-                    return memo[key]
-
-                def is_satisfied(clause):
-                    return any((lit > 0 and assignment.get(abs(lit), False)) or (lit < 0 and not assignment.get(abs(lit), False)) for lit in clause)
-
-                def is_unsatisfied(clause):
-                    return all((lit > 0 and not assignment.get(abs(lit), True)) or (lit < 0 and assignment.get(abs(lit), False)) for lit in clause)
-
-                if all(is_satisfied(clause) for clause in clauses):
-                    memo[key] = assignment
-                    return assignment
-
-                if any(is_unsatisfied(clause) for clause in clauses):
-                    memo[key] = None
-                    return None
-
-                # Pure literal elimination
-                pure_literals = set()
-                all_literals = {lit for clause in clauses for lit in clause}
-                for lit in all_literals:
-                    if -lit not in all_literals:
-                        pure_literals.add(lit)
-                
-                for lit in pure_literals:
-                    assignment[abs(lit)] = lit > 0
-
-                # Primary Unit Clause Processing
-                def process_unit_clauses_primary():
-                    while True:
-                        unit_clauses = [clause for clause in clauses if sum(1 for lit in clause if abs(lit) not in assignment) == 1]
-                        if not unit_clauses:
-                            break
-                        for unit_clause in unit_clauses:
-                            unit_lit = next((lit for lit in unit_clause if abs(lit) not in assignment), None)
-                            if unit_lit is None:
-                                continue  # Skip if no valid literal found
-                            assignment[abs(unit_lit)] = unit_lit > 0
-                            new_clauses = []
-                            for clause in clauses:
-                                if not is_satisfied(clause, assignment):
-                                    # Remove the assigned literal and add clause if still relevant
-                                    new_clause = [lit for lit in clause if abs(lit) != abs(unit_lit)]
-                                    if new_clause:
-                                        new_clauses.append(new_clause)
-                            clauses[:] = new_clauses
-                            # Exit if any clause is unsatisfied after assignment
-                            if any(is_unsatisfied(clause, assignment) for clause in clauses):
-                                return False
-                    return True
-
-                if not process_unit_clauses_primary():
-                    memo[key] = None
-                    return None
-
-                # Fallback Unit Clause Processing
-                def process_unit_clauses_fallback():
-                    unit_clauses = [clause for clause in clauses if sum(1 for lit in clause if abs(lit) not in assignment) == 1]
-                    while unit_clauses:
-                        unit_clause = unit_clauses.pop()
-                        unit_lit = next((lit for lit in unit_clause if abs(lit) not in assignment), None)
-                        if unit_lit is None:
-                            continue
-                        assignment[abs(unit_lit)] = unit_lit > 0
-                        clauses[:] = [clause for clause in clauses if not is_satisfied(clause, assignment)]
-                        unit_clauses = [clause for clause in clauses if sum(1 for lit in clause if abs(lit) not in assignment) == 1]
-                    return None
-
-                if not process_unit_clauses_fallback():
-                    memo[key] = None
-                    return None
-
-                # Choose the first unassigned variable
-                unassigned_vars = {abs(lit) for clause in clauses for lit in clause if abs(lit) not in assignment}
-                if not unassigned_vars:
-                    memo[key] = None
-                    return None
-
-                variable = unassigned_vars.pop()
-                for value in [True, False]:
-                    result = retry_dpll(clauses, {**assignment, variable: value})
-                    if result is not None:
-                        memo[key] = result
-                        return result
-                memo[key] = None
-                return None
-
-            retry_result = retry_dpll(clauses) is not None
-            results[-1] = f"Test {i + 1}: {'Pass' if retry_result == expected else 'Fail'}"
+    for clauses, assigned, value, expected in seeded_cases:
+        passed = (dpll(clauses, assigned, value) is not None) == expected
+        results.append(f"Test {len(results) + 1}: {'Pass' if passed else 'Fail'}")
     return " | ".join(results)
 
-results = run_tests()
-print(results)
-
-# Example cities data
-cities = [
-    {'name': 'City0', 'x': 0, 'y': 0},
-    {'name': 'City1', 'x': 10, 'y': 10},
-    {'name': 'City2', 'x': 20, 'y': 20},
-    {'name': 'City3', 'x': 30, 'y': 5},
-]
-
-# Run the TSP solver and print results
-result = solve_tsp(cities)
-print("Optimized Path:", result['optimized_path'])
-print("Optimized Distance:", result['optimized_distance'])
-print("Optimization Time (ms):", result['optimized_time'])
-print("Optimized Array:", result['optimized_array'])
-
-# Example SAT problem to solve
-clauses = [
-    [1, -2], [2, 3], [-1, -3]
-]
-
-# Run the SAT solver and print results
-memo.clear()
-sat_result = dpll(clauses)
-print("SAT Solver Result:", sat_result)
-
-# Test 3 failed. Retesting with fallback unit clause processing...
-# Test 4 failed. Retesting with fallback unit clause processing...
-# Test 5 failed. Retesting with fallback unit clause processing...
-# Test 1: Pass | Test 2: Pass | Test 3: Pass | Test 4: Pass | Test 5: Fail
+# Numba loads cached kernels by importing this file under its module name, so only run the tests and
+# examples when executed as a script
+if __name__ == "__main__":
+    results = run_tests()
+    print(results)
+
+    # Example cities data
+    cities = [
+        {'name': 'City0', 'x': 0, 'y': 0},
+        {'name': 'City1', 'x': 10, 'y': 10},
+        {'name': 'City2', 'x': 20, 'y': 20},
+        {'name': 'City3', 'x': 30, 'y': 5},
+    ]
+
+    # Run the TSP solver and print results
+    result = solve_tsp(cities, profile=True)
+    print("Optimized Path:", result['optimized_path'])
+    print("Optimized Distance:", result['optimized_distance'])
+    print("Optimization Time (ms):", result['optimized_time'])
+    print("Optimized Array:", result['optimized_array'])
+
+    # Example SAT problem to solve
+    clauses = [
+        [1, -2], [2, 3], [-1, -3]
+    ]
+
+    # Run the SAT solver and print results
+    sat_result = solve_sat(clauses)
+    print("SAT Solver Result:", sat_result)
+
+# Test 1: Pass | Test 2: Pass | Test 3: Pass | Test 4: Pass | Test 5: Pass | Test 6: Pass | Test 7: Pass
 # Path validation successful: Each city is visited once, and path returns to origin.
 # Optimized Path: ['City0', 'City1', 'City2', 'City3', 'City0']
 # Optimized Distance: 76.72584027627295
-# Optimization Time (ms): 0.0
-# Optimized Array: [{'name': 'City0', 'x': 0, 'y': 0}, {'name': 'City1', 'x': 10, 'y': 10}, {'name': 'City2', 'x': 20, 'y': 20}, {'name': 'City3', 'x': 30, 'y': 5}, {'name': 'City0', 'x': 0, 'y': 0}]
-# SAT Solver Result: {1: True, 2: True}
+# Optimization Time (ms): 0.266071
+# Optimized Array: [{'name': 'City0', 'x': 0.0, 'y': 0.0}, {'name': 'City1', 'x': 10.0, 'y': 10.0}, {'name': 'City2', 'x': 20.0, 'y': 20.0}, {'name': 'City3', 'x': 30.0, 'y': 5.0}, {'name': 'City0', 'x': 0.0, 'y': 0.0}]
+# SAT Solver Result: {1: True, 2: True, 3: False}